@@ -1,6 +1,13 @@
 """Main entry point for the SNOTEL MCP server."""
 
-from . import mcp
+from . import mcp, warmup_kernels
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        # uvloop is unavailable on Windows; the default loop works fine
+        pass
+    warmup_kernels()
     mcp.run()
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Compiled statistics kernels for the snowpack analysis tools
+
+The snow-depth statistics are a single fused pass over a contiguous
+float array. With numba installed the loop is JIT-compiled; otherwise
+the plain-Python version runs, which is fine for season-length arrays.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional accelerator
+    njit = None
+
+
+def _snow_stats_impl(depths):  # noqa: ANN001 - numba-compiled signature
+    """One-pass peak/average/snow-day/snowfall statistics
+
+    Returns (peak, peak_idx, average, days_with_snow, total_new_snow,
+    biggest_gain, biggest_gain_idx) for a non-empty depth series.
+    Gain indices refer to positions in the input array.
+    """
+    peak = depths[0]
+    peak_idx = 0
+    total = 0.0
+    snow_days = 0
+    total_new = 0.0
+    biggest = 0.0
+    biggest_idx = 0
+
+    for i in range(depths.shape[0]):
+        d = depths[i]
+        if d > peak:
+            peak = d
+            peak_idx = i
+        total += d
+        if d > 0:
+            snow_days += 1
+        if i > 0:
+            delta = d - depths[i - 1]
+            if delta > 0:
+                total_new += delta
+                if delta > biggest:
+                    biggest = delta
+                    biggest_idx = i
+
+    return (peak, peak_idx, total / depths.shape[0], snow_days,
+            total_new, biggest, biggest_idx)
+
+
+if njit is not None:
+    snow_stats = njit(cache=True, fastmath=True)(_snow_stats_impl)
+else:
+    snow_stats = _snow_stats_impl
+
+
+def warmup() -> None:
+    """Trigger JIT compilation so the first tool call doesn't pay for it"""
+    snow_stats(np.zeros(2, dtype=np.float64))
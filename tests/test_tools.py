@@ -12,6 +12,16 @@ from snotel_mcp_server import mcp
 from fastmcp import Client
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    """Point the global client's disk cache at a per-test directory"""
+    from snotel_mcp_server import api_client
+    api_client.cache_dir = str(tmp_path)
+    api_client._data_cache = None
+    yield
+    api_client._data_cache = None
+
+
 @pytest_asyncio.fixture
 async def client():
     """Create a FastMCP client for testing"""
@@ -47,10 +57,10 @@ async def test_find_snotel_stations_tool(mock_get_stations, client):
 
 
 @pytest.mark.asyncio
-@patch('snotel_mcp_server.api_client.get_stations')
-async def test_get_station_info_tool(mock_get_stations, client):
+@patch('snotel_mcp_server.api_client._request')
+async def test_get_station_info_tool(mock_request, client):
     """Test the get_station_info tool"""
-    mock_get_stations.return_value = [
+    mock_request.return_value = [
         {
             "stationTriplet": "713:CO:SNTL",
             "name": "Red Mountain Pass",
@@ -62,7 +72,7 @@ async def test_get_station_info_tool(mock_get_stations, client):
             "countyName": "San Juan"
         }
     ]
-    
+
     result = await client.call_tool("get_station_info", {"station_triplet": "713:CO:SNTL"})
     result_text = result[0].text  # Extract text from TextContent
     
@@ -72,6 +82,11 @@ async def test_get_station_info_tool(mock_get_stations, client):
     assert "11,080 feet" in result_text
     assert "San Juan" in result_text
 
+    # The exact triplet is requested server-side, not the whole state
+    mock_request.assert_called_once_with(
+        "stations", {"stationTriplets": "713:CO:SNTL"}
+    )
+
 
 @pytest.mark.asyncio
 @patch('snotel_mcp_server.api_client.get_station_data')
@@ -143,6 +158,262 @@ async def test_get_station_data_with_duration(mock_get_data, client):
     assert "713:CO:SNTL" in result_text
 
 
+@pytest.mark.asyncio
+@patch('snotel_mcp_server.api_client.get_station_data')
+async def test_get_recent_conditions_tool(mock_get_data, client):
+    """Test the get_recent_conditions tool"""
+    mock_get_data.return_value = [
+        {
+            "stationTriplet": "713:CO:SNTL",
+            "data": [
+                {
+                    "stationElement": {"elementCode": "SNWD"},
+                    "values": [
+                        {"date": "2024-01-01", "value": 40},
+                        {"date": "2024-01-02", "value": 45}
+                    ]
+                },
+                {
+                    "stationElement": {"elementCode": "WTEQ"},
+                    "values": [
+                        {"date": "2024-01-01", "value": 12.0},
+                        {"date": "2024-01-02", "value": 12.5}
+                    ]
+                }
+            ]
+        }
+    ]
+
+    result = await client.call_tool("get_recent_conditions", {
+        "station_triplet": "713:CO:SNTL",
+        "days": 7
+    })
+    result_text = result[0].text  # Extract text from TextContent
+
+    assert "Recent Conditions: 713:CO:SNTL" in result_text
+    assert "Latest Reading (2024-01-02)" in result_text
+    assert "Snow Depth: 45.0\"" in result_text
+    assert "Snow Water Equivalent: 12.5\"" in result_text
+    assert "Maximum: 45.0\"" in result_text
+    assert "Minimum: 40.0\"" in result_text
+
+
+@pytest.mark.asyncio
+async def test_analyze_snowpack_trends_tool(client):
+    """Test the analyze_snowpack_trends tool"""
+    import json
+
+    triples = [
+        ("713:CO:SNTL", "SNWD", "2024-01-01", 40),
+        ("713:CO:SNTL", "SNWD", "2024-01-02", 48),
+        ("713:CO:SNTL", "SNWD", "2024-01-03", 46),
+        ("713:CO:SNTL", "WTEQ", "2024-01-01", 12.0),
+        ("713:CO:SNTL", "WTEQ", "2024-01-02", 13.0),
+        ("713:CO:SNTL", "WTEQ", "2024-01-03", 13.1)
+    ]
+
+    async def fake_stream(station_triplet, start_date, end_date,
+                          elements=None, duration=None):
+        for triple in triples:
+            yield triple
+
+    with patch('snotel_mcp_server.api_client.stream_station_triples', new=fake_stream):
+        result = await client.call_tool("analyze_snowpack_trends", {
+            "station_triplet": "713:CO:SNTL",
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-03"
+        })
+    analysis = json.loads(result[0].text)  # Extract text from TextContent
+
+    assert analysis["station_triplet"] == "713:CO:SNTL"
+    assert analysis["total_records"] == 3
+
+    depth = analysis["snow_depth_analysis"]
+    assert depth["peak_depth"]["value"] == 48.0
+    assert depth["peak_depth"]["date"] == "2024-01-02"
+    assert depth["days_with_snow"] == 3
+
+    swe = analysis["swe_analysis"]
+    assert swe["peak_swe"]["value"] == 13.1
+    assert swe["peak_swe"]["date"] == "2024-01-03"
+
+    snowfall = analysis["snowfall_analysis"]
+    assert snowfall["total_new_snow"] == 8.0
+    assert snowfall["snow_days"] == 1
+    assert snowfall["biggest_day"]["date"] == "2024-01-02"
+    assert snowfall["snowfall_events"] == [{"date": "2024-01-02", "amount": 8.0}]
+
+
+@pytest.mark.asyncio
+async def test_get_station_data_batches_concurrent_calls(tmp_path):
+    """Concurrent get_station_data calls with the same window share one request"""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from snotel_mcp_server import SnotelAPIClient
+
+    api = SnotelAPIClient(cache_dir=str(tmp_path))
+    api._request = AsyncMock(return_value=[
+        {"stationTriplet": "713:CO:SNTL", "data": []},
+        {"stationTriplet": "538:CO:SNTL", "data": []}
+    ])
+
+    results = await asyncio.gather(
+        api.get_station_data("713:CO:SNTL", "2024-01-01", "2024-01-10"),
+        api.get_station_data("538:CO:SNTL", "2024-01-01", "2024-01-10")
+    )
+
+    assert api._request.call_count == 1
+    params = api._request.call_args[0][1]
+    assert params["stationTriplets"] == "713:CO:SNTL,538:CO:SNTL"
+    assert results[0] == [{"stationTriplet": "713:CO:SNTL", "data": []}]
+    assert results[1] == [{"stationTriplet": "538:CO:SNTL", "data": []}]
+
+
+@pytest.mark.asyncio
+async def test_stream_station_triples(tmp_path):
+    """stream_station_triples pull-parses the response into tuples"""
+    import json
+
+    from snotel_mcp_server import SnotelAPIClient
+
+    body = json.dumps([
+        {
+            "stationTriplet": "713:CO:SNTL",
+            "data": [
+                {
+                    "stationElement": {"elementCode": "SNWD"},
+                    "values": [
+                        {"date": "2024-01-01", "value": 45},
+                        {"date": "2024-01-02", "value": None}
+                    ]
+                }
+            ]
+        }
+    ]).encode()
+
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        async def aiter_bytes(self):
+            yield body
+
+    class FakeStream:
+        async def __aenter__(self):
+            return FakeResponse()
+
+        async def __aexit__(self, *args):
+            return False
+
+    class FakeClient:
+        def stream(self, method, url, params=None):
+            return FakeStream()
+
+    api = SnotelAPIClient(cache_dir=str(tmp_path))
+    api._get_client = lambda: FakeClient()
+
+    triples = [
+        t async for t in api.stream_station_triples(
+            "713:CO:SNTL", "2024-01-01", "2024-01-02"
+        )
+    ]
+
+    assert triples == [
+        ("713:CO:SNTL", "SNWD", "2024-01-01", 45),
+        ("713:CO:SNTL", "SNWD", "2024-01-02", None)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_station_data_multi_triplet_bypasses_batching(tmp_path):
+    """Comma-separated and wildcard inputs return the full response"""
+    from unittest.mock import AsyncMock
+
+    from snotel_mcp_server import SnotelAPIClient
+
+    api = SnotelAPIClient(cache_dir=str(tmp_path))
+    api._request = AsyncMock(return_value=[
+        {"stationTriplet": "713:CO:SNTL", "data": []},
+        {"stationTriplet": "538:CO:SNTL", "data": []}
+    ])
+
+    result = await api.get_station_data(
+        "713:CO:SNTL,538:CO:SNTL", "2024-01-01", "2024-01-10"
+    )
+
+    assert api._request.call_count == 1
+    params = api._request.call_args[0][1]
+    assert params["stationTriplets"] == "713:CO:SNTL,538:CO:SNTL"
+    assert [s["stationTriplet"] for s in result] == ["713:CO:SNTL", "538:CO:SNTL"]
+
+    wildcard = await api.get_station_data("*:CO:SNTL", "2024-01-01", "2024-01-10")
+    assert len(wildcard) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_station_data_parallel_elements(tmp_path):
+    """parallel_elements fans out one request per element and merges them"""
+    from unittest.mock import AsyncMock
+
+    from snotel_mcp_server import SnotelAPIClient
+
+    def response_for(element):
+        return [
+            {
+                "stationTriplet": "713:CO:SNTL",
+                "data": [
+                    {
+                        "stationElement": {"elementCode": element},
+                        "values": [{"date": "2024-01-01", "value": 1}]
+                    }
+                ]
+            }
+        ]
+
+    api = SnotelAPIClient(cache_dir=str(tmp_path))
+    api._request = AsyncMock(
+        side_effect=lambda endpoint, params: response_for(params["elements"])
+    )
+
+    result = await api.get_station_data(
+        "713:CO:SNTL", "2024-01-01", "2024-01-10",
+        elements=["SNWD", "WTEQ"], parallel_elements=True
+    )
+
+    assert api._request.call_count == 2
+    assert len(result) == 1
+    codes = [d["stationElement"]["elementCode"] for d in result[0]["data"]]
+    assert codes == ["SNWD", "WTEQ"]
+
+
+@pytest.mark.asyncio
+async def test_get_station_data_caches_historical_ranges(tmp_path):
+    """Historical get_station_data responses are served from the disk cache"""
+    from unittest.mock import AsyncMock
+
+    from snotel_mcp_server import SnotelAPIClient
+
+    api = SnotelAPIClient(cache_dir=str(tmp_path))
+    api._request = AsyncMock(return_value=[
+        {
+            "stationTriplet": "713:CO:SNTL",
+            "data": [
+                {
+                    "stationElement": {"elementCode": "SNWD"},
+                    "values": [{"date": "2024-01-01", "value": 45}]
+                }
+            ]
+        }
+    ])
+
+    first = await api.get_station_data("713:CO:SNTL", "2024-01-01", "2024-01-10")
+    second = await api.get_station_data("713:CO:SNTL", "2024-01-01", "2024-01-10")
+
+    assert api._request.call_count == 1
+    assert second == first
+
+
 @pytest.mark.asyncio
 async def test_mcp_server_initialization():
     """Test that the MCP server is properly initialized"""